@@ -3,8 +3,9 @@ from typing import Any
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify
 from datetime import datetime
+from bot.config import DEBUG
 from bot.storage import save_token_data, load_token_data
-from bot.telegram_bot import send_server_telegram_alert
+from bot.telegram_bot import build_quality_alert, send_telegram_alert
 from bot.token_quality import TokenQualityAnalyzer, quick_filter
 
 load_dotenv()
@@ -28,7 +29,6 @@ def process_pool():
         return jsonify({"status": "unauthorized"}, 401)
 
     pool_data: list[dict[str, Any]] = request.get_json()
-    tracked_tokens = load_token_data()
     token_details = pool_data[0]["tokenTransfers"]
     signature = pool_data[0]["signature"]
 
@@ -61,64 +61,28 @@ def process_pool():
         token1
     )
 
-    # Print analysis summary
-    print(f"[WEBHOOK] Quality Score: {analysis['quality_score']}/100")
-    for reason in analysis['reasons']:
-        print(f"[WEBHOOK]   {reason}")
+    # Print analysis summary (per-check reasons only when debugging)
+    print(f"[WEBHOOK] Quality Score: {analysis.quality_score}/100")
+    if DEBUG:
+        for reason in analysis.reasons:
+            print(f"[WEBHOOK]   {reason}")
 
     # Step 3: Only alert on high-quality tokens
-    if analysis['should_alert']:
-        # Determine which token is SOL and which is the new token
-        SOLANA_MINT_ADDRESS = "So11111111111111111111111111111111111111112"
-
-        if token0 == SOLANA_MINT_ADDRESS:
-            token_address = token1
-            token_volume = token1_volume
-        else:
-            token_address = token0
-            token_volume = token0_volume
-
+    if analysis.should_alert:
         # Create enhanced alert with quality metrics
-        alert_message = (
-            f"🚀 *HIGH QUALITY GEM DETECTED!* (Webhook)\n\n"
-            f"⭐ *Quality Score:* {analysis['quality_score']}/100\n"
-            f"💰 *Market Cap:* ${analysis['market_cap']:,.0f}\n"
-            f"💧 *Liquidity:* {analysis['liquidity_sol']:.2f} SOL\n\n"
-            f"🪙 *Token:* `{token_address}`\n"
-            f"📊 *Supply in Pool:* {token_volume:,.0f}\n"
-            f"🏪 *Exchange:* {exchange}\n\n"
-            f"🔒 *Security:*\n"
-            f"{'✅' if analysis['security_checks'].get('mint_authority_revoked') else '❌'} Mint Authority Revoked\n"
-            f"{'✅' if analysis['security_checks'].get('freeze_authority_revoked') else '❌'} Freeze Authority Revoked\n\n"
-            f"📈 *Analysis:*\n"
-        )
-
-        # Add top analysis reasons
-        for reason in analysis['reasons'][:5]:  # Top 5 reasons
-            alert_message += f"• {reason}\n"
-
-        alert_message += (
-            f"\n🔗 *Links:*\n"
-            f"[Solscan](https://solscan.io/token/{token_address}) | "
-            f"[DexScreener](https://dexscreener.com/solana/{amm_address or token_address}) | "
-            f"[Swap](https://raydium.io/swap/?inputMint=So11111111111111111111111111111111111111112&outputMint={token_address})\n\n"
-            f"🧾 *Tx:* https://solscan.io/tx/{signature}"
+        alert_message = build_quality_alert(
+            analysis,
+            amm_address or analysis.token_address,
+            signature,
+            source=" (Webhook)",
+            exchange=exchange,
         )
 
-        print(f"[WEBHOOK] 🚀 SENDING ALERT! Quality score: {analysis['quality_score']}/100")
-        send_server_telegram_alert(signature, {
-            "exchange": exchange,
-            "token0": token0,
-            "token0_volume": token0_volume,
-            "token1": token1,
-            "token1_volume": token1_volume,
-            "time_stamp": timestamp,
-            "quality_score": analysis['quality_score'],
-            "market_cap": analysis['market_cap'],
-            "liquidity_sol": analysis['liquidity_sol']
-        }, custom_message=alert_message)
+        print(f"[WEBHOOK] 🚀 SENDING ALERT! Quality score: {analysis.quality_score}/100")
+        send_telegram_alert(alert_message)
 
-        # Track this token
+        # Track this token (the store is only read once we know we need it)
+        tracked_tokens = load_token_data()
         tracked_tokens[signature] = {
             "exchange": exchange,
             "token0": token0,
@@ -126,9 +90,9 @@ def process_pool():
             "token1": token1,
             "token1_volume": token1_volume,
             "time_stamp": str(datetime.fromtimestamp(timestamp)),
-            "quality_score": analysis['quality_score'],
-            "market_cap": analysis['market_cap'],
-            "liquidity_sol": analysis['liquidity_sol']
+            "quality_score": analysis.quality_score,
+            "market_cap": analysis.market_cap,
+            "liquidity_sol": analysis.liquidity_sol
         }
         save_token_data(tracked_tokens)
         print(f"[WEBHOOK] ✅ Alert sent and token tracked!")
@@ -136,14 +100,14 @@ def process_pool():
         return jsonify({
             "status": "success",
             "action": "alerted",
-            "quality_score": analysis['quality_score']
+            "quality_score": analysis.quality_score
         }), 200
     else:
-        print(f"[WEBHOOK] ❌ Quality score too low: {analysis['quality_score']}/100")
+        print(f"[WEBHOOK] ❌ Quality score too low: {analysis.quality_score}/100")
         return jsonify({
             "status": "success",
             "action": "filtered",
-            "quality_score": analysis['quality_score']
+            "quality_score": analysis.quality_score
         }), 200
 
 
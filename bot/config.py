@@ -4,8 +4,21 @@ from dotenv import load_dotenv
 load_dotenv()
 SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL")
 SOLANA_RPC_WSS = os.getenv("SOLANA_RPC_WSS")
+# Optional comma-separated backup RPC URLs, tried in order when SOLANA_RPC_URL fails
+SOLANA_RPC_FALLBACK_URLS = [
+    url.strip() for url in os.getenv("SOLANA_RPC_FALLBACK_URLS", "").split(",") if url.strip()
+]
 # SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com"
 
+# Verbose per-pool output (noisy, off by default): full tracebacks for per-pool
+# errors, every scoring reason from the bot loop and the webhook, and the
+# NEW POOL banner from the detector
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+# Send the analyzer's RPC lookups as one JSON-RPC batch. Turn off for providers
+# that reject batches or bill every call inside one as a separate request
+RPC_BATCH_REQUESTS = os.getenv("RPC_BATCH_REQUESTS", "true").lower() == "true"
+
 
 START_DATE = "2024-12-15"  # Date to start detecting tokens from
 RESET_INTERVAL_DAYS = 2  # Time interval to reset volumes and market caps
@@ -1,28 +1,59 @@
 import asyncio
 import traceback
-from bot.token_detector import run
-from bot.telegram_bot import send_telegram_alert
+from concurrent.futures import ThreadPoolExecutor
+from bot.config import DEBUG
+from bot.token_detector import fetch_pool, record_pool, run
+from bot.telegram_bot import build_quality_alert, send_telegram_alert
 from bot.token_quality import TokenQualityAnalyzer, quick_filter
 from dotenv import load_dotenv
 import psutil
 
 load_dotenv()  # Load environment variables from .env
 
-SOLANA_MINT_ADDRESS = "So11111111111111111111111111111111111111112"
-
 # Initialize quality analyzer
 quality_analyzer = TokenQualityAnalyzer()
 
 
+# Pools analyzed at once; the detector keeps reading while these run
+MAX_CONCURRENT_ANALYSES = 16
+
+# Analyses get their own worker threads, one per slot. The loop's default
+# executor is only cpu_count + 4 threads and also runs the detector's
+# transaction fetch and the Telegram sends, which must not queue behind them
+analysis_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ANALYSES, thread_name_prefix="analysis")
+
+
+class _Stats:
+    """Running detection counters shared by the detector loop and analysis tasks"""
+
+    __slots__ = ("detected", "filtered", "alerted")
+
+    def __init__(self) -> None:
+        self.detected = 0
+        self.filtered = 0
+        self.alerted = 0
+
+    def summary(self) -> str:
+        return f"Detected {self.detected} | Filtered {self.filtered} | Alerted {self.alerted}"
+
+
 async def run_bot() -> None:
     print("Starting Solana Bot with Quality Filtering...")
-    total_detected = 0
-    filtered_out = 0
-    alerts_sent = 0
+    stats = _Stats()
+    analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+    pending: set[asyncio.Task] = set()
 
-    try:
-        async for signature, pool, volumes in run():
-            total_detected += 1
+    async def process_pool(number: int, signature: str) -> None:
+        try:
+            # Fetch the pool's transaction here rather than in the detector, so a
+            # slow fetch never stops the WebSocket reader (blocking HTTP with
+            # retries, run on the default executor, away from the analysis pool)
+            fetched = await asyncio.to_thread(fetch_pool, signature)
+            if fetched is None:
+                print(f"[{number}] Could not read pool transaction {signature}")
+                return
+            pool, volumes = fetched
+            record_pool(signature, pool, volumes)
 
             # Step 1: Quick pre-filter (saves API calls)
             if not quick_filter(
@@ -31,77 +62,76 @@ async def run_bot() -> None:
                 pool['Token0'],
                 pool['Token1']
             ):
-                filtered_out += 1
-                print(f"[{total_detected}] ❌ Quick filter rejected - Bad liquidity or pump.fun")
-                continue
-
-            print(f"[{total_detected}] ✓ Passed quick filter - Running full analysis...")
+                stats.filtered += 1
+                print(f"[{number}] ❌ Quick filter rejected - Bad liquidity or pump.fun")
+                return
+
+            print(f"[{number}] ✓ Passed quick filter - Running full analysis...")
+        except Exception as e:
+            print(f"[{number}] Error fetching pool {signature}: {e}")
+            if DEBUG:
+                print(traceback.format_exc())
+            return
+
+        async with analysis_slots:
+            try:
+                # Step 2: Full quality analysis (blocking RPC calls, run on the analysis pool)
+                analysis = await asyncio.get_running_loop().run_in_executor(
+                    analysis_pool,
+                    quality_analyzer.analyze_token,
+                    pool['Amm'],  # AMM address
+                    volumes['Token0Volume'],
+                    volumes['Token1Volume'],
+                    pool['Token0'],
+                    pool['Token1']
+                )
 
-            # Step 2: Full quality analysis
-            analysis = quality_analyzer.analyze_token(
-                pool['Amm'],  # AMM address
-                volumes['Token0Volume'],
-                volumes['Token1Volume'],
-                pool['Token0'],
-                pool['Token1']
-            )
-
-            # Print analysis summary
-            print(f"Quality Score: {analysis['quality_score']}/100")
-            for reason in analysis['reasons']:
-                print(f"  {reason}")
-
-            # Step 3: Only alert on high-quality tokens
-            if analysis['should_alert']:
-                alerts_sent += 1
-
-                # Determine token addresses for links
-                if pool['Token0'] == SOLANA_MINT_ADDRESS:
-                    token_address = pool['Token1']
-                    token_volume = volumes['Token1Volume']
-                    sol_volume = volumes['Token0Volume']
+                # Print analysis summary (per-check reasons only when debugging)
+                print(f"[{number}] Quality Score: {analysis.quality_score}/100")
+                if DEBUG:
+                    for reason in analysis.reasons:
+                        print(f"  {reason}")
+
+                # Step 3: Only alert on high-quality tokens
+                if analysis.should_alert:
+                    stats.alerted += 1
+
+                    # Create enhanced alert with quality metrics
+                    alert_message = build_quality_alert(
+                        analysis,
+                        pool['Amm'],
+                        signature,
+                        footer=f"\n\n⚡ Stats: {stats.summary()}",
+                    )
+
+                    print(f"🚀 SENDING ALERT! Quality score: {analysis.quality_score}/100")
+                    # Post from a worker thread so the blocking HTTP call does not stall the event loop
+                    await asyncio.to_thread(send_telegram_alert, alert_message)
+                    print("✅ Alert sent!")
                 else:
-                    token_address = pool['Token0']
-                    token_volume = volumes['Token0Volume']
-                    sol_volume = volumes['Token1Volume']
-
-                # Create enhanced alert with quality metrics
-                alert_message = (
-                    f"🚀 *HIGH QUALITY GEM DETECTED!*\n\n"
-                    f"⭐ *Quality Score:* {analysis['quality_score']}/100\n"
-                    f"💰 *Market Cap:* ${analysis['market_cap']:,.0f}\n"
-                    f"💧 *Liquidity:* {analysis['liquidity_sol']:.2f} SOL\n\n"
-                    f"🪙 *Token:* `{token_address}`\n"
-                    f"📊 *Supply in Pool:* {token_volume:,.0f}\n\n"
-                    f"🔒 *Security:*\n"
-                    f"{'✅' if analysis['security_checks'].get('mint_authority_revoked') else '❌'} Mint Authority Revoked\n"
-                    f"{'✅' if analysis['security_checks'].get('freeze_authority_revoked') else '❌'} Freeze Authority Revoked\n\n"
-                    f"📈 *Analysis:*\n"
-                )
+                    stats.filtered += 1
+                    print(f"❌ Quality score too low: {analysis.quality_score}/100 (minimum 70)")
+                    print(f"   Stats: {stats.summary()}")
+            except Exception as e:
+                print(f"[{number}] Error analyzing pool {signature}: {e}")
+                if DEBUG:
+                    print(traceback.format_exc())
 
-                # Add top analysis reasons
-                for reason in analysis['reasons'][:5]:  # Top 5 reasons
-                    alert_message += f"• {reason}\n"
-
-                alert_message += (
-                    f"\n🔗 *Links:*\n"
-                    f"[Solscan](https://solscan.io/token/{token_address}) | "
-                    f"[DexScreener](https://dexscreener.com/solana/{pool['Amm']}) | "
-                    f"[Swap](https://raydium.io/swap/?inputMint=So11111111111111111111111111111111111111112&outputMint={token_address})\n\n"
-                    f"🧾 *Tx:* https://solscan.io/tx/{signature}\n\n"
-                    f"⚡ Stats: Detected {total_detected} | Filtered {filtered_out} | Alerted {alerts_sent}"
-                )
+    try:
+        async for signature in run():
+            stats.detected += 1
 
-                print(f"🚀 SENDING ALERT! Quality score: {analysis['quality_score']}/100")
-                send_telegram_alert(alert_message)
-                print("✅ Alert sent!")
-            else:
-                filtered_out += 1
-                print(f"❌ Quality score too low: {analysis['quality_score']}/100 (minimum 70)")
-                print(f"   Stats: Detected {total_detected} | Filtered {filtered_out} | Alerted {alerts_sent}")
+            # Fetch and analyze in the background so the detector can keep
+            # draining notifications (and answering keepalive pings)
+            task = asyncio.create_task(process_pool(stats.detected, signature))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
 
     except asyncio.CancelledError:
         print("Bot is shutting down gracefully...")
+        for task in pending:
+            task.cancel()
+        analysis_pool.shutdown(wait=False, cancel_futures=True)
         raise  # Re-raise the exception to ensure the task is cancelled
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -1,6 +1,6 @@
-import requests
 import time
 
+from rpc import get_rpc_session
 from storage import load_token_data, save_token_data
 
 # Configuration
@@ -20,7 +20,7 @@ def fetch_balance(account_pubkey):
             "method": "getTokenAccountBalance",
             "params": [account_pubkey],
         }
-        response = requests.post(RPC_URL, json=body)
+        response = get_rpc_session().post(RPC_URL, json=body)
         response.raise_for_status()
         data = response.json()
         return int(data["result"]["value"]["amount"]) if "result" in data else 0
@@ -41,7 +41,7 @@ def fetch_recent_transactions():
                 {"limit": 50},
             ],  # Fetch the latest 10 transactions
         }
-        response = requests.post(RPC_URL, json=body)
+        response = get_rpc_session().post(RPC_URL, json=body)
         response.raise_for_status()
         data = response.json()
         if "result" in data:
@@ -65,7 +65,7 @@ def fetch_transaction_details(signature):
                 {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0},
             ],  # Detailed info
         }
-        response = requests.post(RPC_URL, json=body)
+        response = get_rpc_session().post(RPC_URL, json=body)
         response.raise_for_status()
         data = response.json()
         return data["result"] if "result" in data else None
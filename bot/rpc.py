@@ -0,0 +1,39 @@
+"""
+Shared HTTP sessions for Solana JSON-RPC calls
+"""
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+# Connections kept open to the RPC host; sized for the analyses running in
+# parallel worker threads (see MAX_CONCURRENT_ANALYSES in bot.main) so they
+# don't queue on requests' default pool of 10
+POOL_MAXSIZE = 32
+
+# For request bodies pre-encoded with orjson, where the content type isn't set
+# automatically as it is for json=
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+@lru_cache(maxsize=None)
+def get_rpc_session(retries: int = 0) -> requests.Session:
+    """
+    Build a pooled RPC session once per retry budget and reuse it, so the
+    detector and the quality analyzer keep their connections to the RPC node
+    alive instead of opening a new one per request.
+    """
+    session = requests.Session()
+    if retries:
+        retry = Retry(
+            total=retries,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+        )
+        adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE, max_retries=retry)  # type: ignore
+    else:
+        adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+    # Plain http too, e.g. a local validator at http://127.0.0.1:8899
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,17 +1,21 @@
-import json
 from pathlib import Path
 from typing import Any
+import orjson
 
 DATA_FILE = Path("tracked_tokens.json")
+# Pools seen by the detector. Kept apart from DATA_FILE because the detector
+# holds its store in memory and rewrites it whole, which would clobber the
+# tokens the webhook records in DATA_FILE
+DETECTED_POOLS_FILE = Path("detected_pools.json")
 
 
-def save_token_data(data: dict) -> None:
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f)
+def save_token_data(data: dict, path: Path = DATA_FILE) -> None:
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data))
 
 
-def load_token_data() -> Any | dict:
-    if DATA_FILE.exists():
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
+def load_token_data(path: Path = DATA_FILE) -> Any | dict:
+    if path.exists():
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     return {}
@@ -1,10 +1,107 @@
+import html
+import threading
+import time
 from datetime import datetime
 from typing import Any, cast
 import telegram
-import requests
+import httpx
+import orjson
 from bot.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from bot.rpc import JSON_HEADERS
+from bot.token_quality import WSOL_ADDRESS, AnalysisResult
 
-SOLANA_MINT_ADDRESS = "So11111111111111111111111111111111111111112"
+_SEND_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+_SEND_ATTEMPTS = 3  # Tries per message on timeouts and 5xx responses
+_MAX_RETRY_AFTER = 30.0  # Longest 429 wait in seconds, so a send can't park a worker thread
+
+# Quality alert layout, filled once per alert with str.format_map.
+# Dynamic text is HTML-escaped before it is substituted in.
+_QUALITY_ALERT_TEMPLATE = (
+    "🚀 <b>HIGH QUALITY GEM DETECTED!</b>{source}\n\n"
+    "⭐ <b>Quality Score:</b> {quality_score}/100\n"
+    "💰 <b>Market Cap:</b> ${market_cap:,.0f}\n"
+    "💧 <b>Liquidity:</b> {liquidity_sol:.2f} SOL\n\n"
+    "🪙 <b>Token:</b> <code>{token_address}</code>\n"
+    "📊 <b>Supply in Pool:</b> {token_volume:,.0f}\n"
+    "{exchange_line}\n"
+    "🔒 <b>Security:</b>\n"
+    "{mint_icon} Mint Authority Revoked\n"
+    "{freeze_icon} Freeze Authority Revoked\n\n"
+    "📈 <b>Analysis:</b>\n"
+    "{reasons}"
+    "\n🔗 <b>Links:</b>\n"
+    '<a href="https://solscan.io/token/{token_address}">Solscan</a> | '
+    '<a href="https://dexscreener.com/solana/{pair_address}">DexScreener</a> | '
+    '<a href="https://raydium.io/swap/?inputMint=' + WSOL_ADDRESS + '&amp;outputMint={token_address}">Swap</a>\n\n'
+    "🧾 <b>Tx:</b> https://solscan.io/tx/{signature}"
+    "{footer}"
+)
+
+# Shared HTTP/2 client so concurrent alerts multiplex over one connection
+_client: httpx.Client | None = None
+# Sends run in worker threads, so guard creation to avoid building two clients
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=True,
+                    timeout=10.0,
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                )
+    return _client
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """
+    Seconds to wait from a 429 response, per Telegram's parameters.retry_after
+    (falling back to the Retry-After header, then 1s), capped at _MAX_RETRY_AFTER.
+    """
+    try:
+        retry_after = float(orjson.loads(response.content)["parameters"]["retry_after"])
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        try:
+            retry_after = float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            retry_after = 1.0  # e.g. an HTTP-date Retry-After
+    return min(max(retry_after, 0.0), _MAX_RETRY_AFTER)
+
+
+def _post_message(message: str) -> None:
+    """
+    Post an HTML-formatted message to the configured Telegram chat.
+    """
+    payload = {
+        "chat_id": TELEGRAM_CHAT_ID,
+        "text": message,
+        "parse_mode": "HTML",
+    }
+    body = orjson.dumps(payload)
+    error: Any = None
+    for attempt in range(_SEND_ATTEMPTS):
+        try:
+            response = _get_client().post(_SEND_URL, content=body, headers=JSON_HEADERS)
+        except httpx.TransportError as e:
+            error = e
+        else:
+            if response.status_code == 200:
+                return
+            error = response.content
+            if response.status_code == 429 and attempt + 1 < _SEND_ATTEMPTS:
+                # Throttled: wait exactly as long as Telegram asks before retrying
+                time.sleep(_retry_after(response))
+                continue
+            # Other 4xx means a bad request or chat, retrying won't help
+            if response.status_code < 500:
+                break
+        if attempt + 1 < _SEND_ATTEMPTS:
+            time.sleep(0.5 * 2**attempt)  # 0.5s, 1s, ...
+
+    print(f"Failed to send Telegram message: {error}")
 
 
 async def send_telegram_alert_async(
@@ -25,16 +122,37 @@ def send_telegram_alert(message: str) -> None:
     """
     Send a notification to Telegram.
     """
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown",
-    }
-    response = requests.post(url, json=payload)
+    _post_message(message)
+
 
-    if response.status_code != 200:
-        print(f"Failed to send Telegram message: {response.content}")
+def build_quality_alert(
+    analysis: AnalysisResult,
+    pair_address: str,
+    signature: str,
+    source: str = "",
+    exchange: str | None = None,
+    footer: str = "",
+) -> str:
+    """
+    Build the HTML alert for a token that passed the quality filter.
+    """
+    security = analysis.security_checks
+    token_address = analysis.token_address
+    return _QUALITY_ALERT_TEMPLATE.format_map({
+        "source": source,
+        "quality_score": analysis.quality_score,
+        "market_cap": analysis.market_cap,
+        "liquidity_sol": analysis.liquidity_sol,
+        "token_address": token_address,
+        "token_volume": analysis.token_volume,
+        "exchange_line": f"🏪 <b>Exchange:</b> {html.escape(exchange)}\n" if exchange else "",
+        "mint_icon": "✅" if security.get("mint_authority_revoked") else "❌",
+        "freeze_icon": "✅" if security.get("freeze_authority_revoked") else "❌",
+        "reasons": "".join(f"• {html.escape(reason)}\n" for reason in analysis.reasons[:5]),  # Top 5 reasons
+        "pair_address": pair_address,
+        "signature": signature,
+        "footer": footer,
+    })
 
 
 def send_server_telegram_alert(signature: str, new_pool: dict[str, Any], custom_message: str | None = None) -> None:
@@ -46,23 +164,14 @@ def send_server_telegram_alert(signature: str, new_pool: dict[str, Any], custom_
         message = custom_message
     else:
         message = (
-            f"🚨 *Token Alert!*\n\n"
-            f"📈 *Exchange:* `{new_pool['exchange']}` \n\n"
-            f"🪙 *Token0:* [{new_pool['token0'] if new_pool['token0']!= SOLANA_MINT_ADDRESS else 'WSOL'}](https://dexscreener.com/solana/{new_pool['token0']}) \n"
-            f"💸 *Token0Volume:* {new_pool['token0_volume']}\n\n"
-            f"🪙 *Token1:* [{new_pool['token1'] if new_pool['token1']!= SOLANA_MINT_ADDRESS else 'WSOL'}](https://dexscreener.com/solana/{new_pool['token1']}) \n"
-            f"💸 *Token1Volume:* {new_pool['token1_volume']}\n\n"
-            f"⏳ *List Time:* {datetime.fromtimestamp(float(new_pool['time_stamp']))}(UTC)\n\n"
-            f"🧾 *Signature:* https://solscan.io/tx/{signature}\n\n"
-            f"💱 *Swap:* https://raydium.io/swap/?inputMint={new_pool['token0']}&outputMint={new_pool['token1']}\n"
+            f"🚨 <b>Token Alert!</b>\n\n"
+            f"📈 <b>Exchange:</b> <code>{html.escape(str(new_pool['exchange']))}</code> \n\n"
+            f"🪙 <b>Token0:</b> <a href=\"https://dexscreener.com/solana/{new_pool['token0']}\">{new_pool['token0'] if new_pool['token0']!= WSOL_ADDRESS else 'WSOL'}</a> \n"
+            f"💸 <b>Token0Volume:</b> {new_pool['token0_volume']}\n\n"
+            f"🪙 <b>Token1:</b> <a href=\"https://dexscreener.com/solana/{new_pool['token1']}\">{new_pool['token1'] if new_pool['token1']!= WSOL_ADDRESS else 'WSOL'}</a> \n"
+            f"💸 <b>Token1Volume:</b> {new_pool['token1_volume']}\n\n"
+            f"⏳ <b>List Time:</b> {datetime.fromtimestamp(float(new_pool['time_stamp']))}(UTC)\n\n"
+            f"🧾 <b>Signature:</b> https://solscan.io/tx/{signature}\n\n"
+            f"💱 <b>Swap:</b> https://raydium.io/swap/?inputMint={new_pool['token0']}&amp;outputMint={new_pool['token1']}\n"
         )
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown",
-    }
-    response = requests.post(url, json=payload)
-
-    if response.status_code != 200:
-        print(f"Failed to send Telegram message: {response.content}")
+    _post_message(message)
@@ -1,47 +1,75 @@
 import asyncio
 import json
+import random
 from typing import Any, AsyncGenerator, cast
 import requests
 from requests.exceptions import SSLError
-from urllib3 import Retry
 import websockets
-from decimal import Decimal
-from requests.adapters import HTTPAdapter
-from bot.storage import save_token_data, load_token_data
-from bot.config import SOLANA_RPC_URL, SOLANA_RPC_WSS
+import orjson
+from bot.rpc import JSON_HEADERS, get_rpc_session
+from bot.storage import DETECTED_POOLS_FILE, save_token_data, load_token_data
+from bot.config import DEBUG, SOLANA_RPC_URL, SOLANA_RPC_WSS, SOLANA_RPC_FALLBACK_URLS
 
 # SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com"
 TOKEN_PROGRAM_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
 
-THRESHOLD_VOLUME = Decimal(0)  # Example threshold for volume
-THRESHOLD_MARKET_CAP = Decimal(0)  # Example threshold for market cap
+# Newest pools kept in the tracked store; it is rewritten in full on each new
+# pool, so bounding it caps both memory and per-pool write cost
+MAX_TRACKED_POOLS = 10_000
+
+# Encoded once and re-sent on every reconnect
+LOGS_SUBSCRIBE_REQUEST = json.dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "logsSubscribe",
+        "params": [
+            {"mentions": [TOKEN_PROGRAM_ID]},
+            {"commitment": "confirmed"},
+        ],
+    }
+)
+
+# Constant part of the getTransaction params, shared by every lookup
+GET_TRANSACTION_CONFIG = {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
 
 
-async def run() -> AsyncGenerator[tuple[Any, dict, dict], Any]:
+# Tracked pools by signature. Loaded once and kept in memory; run() reads it to
+# skip known pools and record_pool() writes each new one back
+_pool_store: dict | None = None
+
+
+def _get_pool_store() -> dict:
+    global _pool_store
+    if _pool_store is None:
+        _pool_store = load_token_data(DETECTED_POOLS_FILE)
+    return _pool_store
+
+
+async def run() -> AsyncGenerator[str, Any]:
+    """
+    Yield the signature of each new pool initialization.
+
+    Only filters and dispatches: the slow getTransaction fetch is left to the
+    caller (see fetch_pool), so the reader keeps draining the socket and
+    answering keepalive pings while transactions are fetched.
+    """
     backoff = 1  # Initial backoff time in seconds
     max_backoff = 60  # Maximum backoff time in seconds
+    pool_store = _get_pool_store()
+    # Signatures already handed out but not yet recorded, to skip re-deliveries
+    dispatched: dict[str, None] = {}
     while True:
+        # Ping every 30s so a dead connection is noticed (and reconnected) quickly
         async with websockets.connect(
-            cast(str, SOLANA_RPC_WSS), ping_timeout=None, ping_interval=None
+            cast(str, SOLANA_RPC_WSS), ping_interval=30, ping_timeout=10
         ) as websocket:
             try:
                 # Send subscription request
-                await websocket.send(
-                    json.dumps(
-                        {
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "logsSubscribe",
-                            "params": [
-                                {"mentions": [TOKEN_PROGRAM_ID]},
-                                {"commitment": "confirmed"},
-                            ],
-                        }
-                    )
-                )
+                await websocket.send(LOGS_SUBSCRIBE_REQUEST)
 
                 first_resp = await websocket.recv()
-                response_dict = json.loads(first_resp)
+                response_dict = orjson.loads(first_resp)
                 if "result" in response_dict:
                     print(
                         "Subscription successful. Subscription ID: ",
@@ -50,42 +78,71 @@ async def run() -> AsyncGenerator[tuple[Any, dict, dict], Any]:
 
                 # Continuously read from the WebSocket
                 async for response in websocket:
-                    response_dict = json.loads(response)
-                    pool_store = load_token_data()
-
-                    # if response_dict['params']['result']['value']['err'] == None:
-                    signature = response_dict["params"]["result"]["value"]["signature"]
-
-                    if signature not in pool_store:
-
-                        log_messages_set = set(
-                            response_dict["params"]["result"]["value"]["logs"]
-                        )
-
-                        search = "initialize2"
-                        if any(search in message for message in log_messages_set):
-                            print(f"True, https://solscan.io/tx/{signature}")
-                            postTokenBalances, instructions = get_transaction(signature)
-                            pool = parse_new_pool(instructions)
-                            volumes = parse_amounts(postTokenBalances, pool)
-
-                            yield signature, pool, volumes
-                            pool_store[signature] = {**pool, **volumes}
-                            save_token_data(pool_store)
-                        else:
-                            pass
                     backoff = 1
+                    # Cheap substring test on the raw frame skips decoding the
+                    # notifications that cannot be a pool initialization
+                    if "initialize2" not in response:
+                        continue
+                    response_dict = orjson.loads(response)
+                    value = response_dict["params"]["result"]["value"]
+
+                    # Nearly every notification is a failed tx or not a pool
+                    # initialization, so reject those before any other work
+                    if value["err"] is not None or not any(
+                        "initialize2" in message for message in value["logs"]
+                    ):
+                        continue
+
+                    signature = value["signature"]
+                    if signature in pool_store or signature in dispatched:
+                        continue
+                    dispatched[signature] = None
+                    while len(dispatched) > 1000:
+                        del dispatched[next(iter(dispatched))]
+
+                    print(f"True, https://solscan.io/tx/{signature}")
+                    yield signature
             except websockets.ConnectionClosed as e:
                 print(f"WebSocket connection closed: {e}")
-                await asyncio.sleep(backoff)
+                # Full jitter so many clients don't reconnect in lockstep
+                await asyncio.sleep(random.uniform(0, backoff))
                 backoff = min(backoff * 2, max_backoff)  # Exponential backoff
                 continue
             except Exception as e:
                 print(f"An error occurredR: {e}")
-                await asyncio.sleep(backoff)
+                # Full jitter so many clients don't reconnect in lockstep
+                await asyncio.sleep(random.uniform(0, backoff))
                 backoff = min(backoff * 2, max_backoff)  # Exponential backoff
 
 
+def fetch_pool(signature: str) -> tuple[dict, dict] | None:
+    """
+    Fetch a pool initialization transaction and parse its pool and amounts.
+    Blocking (HTTP with retries); returns None if the transaction or pool
+    could not be read.
+    """
+    transaction = get_transaction(signature)
+    if transaction is None:
+        return None
+    postTokenBalances, instructions = transaction
+    pool = parse_new_pool(instructions)
+    if pool is None:
+        return None
+    return pool, parse_amounts(postTokenBalances, pool)
+
+
+def record_pool(signature: str, pool: dict, volumes: dict) -> None:
+    """
+    Add a detected pool to the tracked store and write it back.
+    """
+    pool_store = _get_pool_store()
+    pool_store[signature] = {**pool, **volumes}
+    # Dicts keep insertion order, so the first key is the oldest pool
+    while len(pool_store) > MAX_TRACKED_POOLS:
+        del pool_store[next(iter(pool_store))]
+    save_token_data(pool_store, DETECTED_POOLS_FILE)
+
+
 def parse_amounts(postTokenBalances: list[dict], pool: dict):
     """
     Get the amounts of tokens in a pool.
@@ -106,45 +163,37 @@ def parse_amounts(postTokenBalances: list[dict], pool: dict):
 
 def get_transaction(signature: str, retries: int = 5) -> tuple[list[dict], list[dict]]:
     """
-    Fetch a transaction by its signature with retry logic.
+    Fetch a transaction by its signature with retry logic, moving on to the
+    backup RPC URLs if the primary one fails.
     """
-    print(signature)
     payload = {
         "jsonrpc": "2.0",
         "id": 1,
         "method": "getTransaction",
-        "params": [
-            signature,
-            {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0},
-        ],
+        "params": [signature, GET_TRANSACTION_CONFIG],
     }
-    session = requests.Session()
-    retry = Retry(
-        total=retries,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["POST"],
-    )
-    adapter = HTTPAdapter(max_retries=retry)  # type: ignore
-    session.mount("https://", adapter)
-    try:
-
-        response = session.post(SOLANA_RPC_URL, json=payload)
-        if response.status_code == 200:
-            result = response.json().get("result")
-            if result:
-                print("============TRANSACTION DETECTED====================")
-
-                return (
-                    result["meta"]["postTokenBalances"],
-                    result["transaction"]["message"]["instructions"],
-                )
-        else:
-            print(f"Attempt failed: {response.json().get('error')}")
-    except SSLError as e:
-        print(f"SSL error occurred: {e}")
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred T: {e}")
+    body = orjson.dumps(payload)
+    session = get_rpc_session(retries)
+    for rpc_url in [SOLANA_RPC_URL, *SOLANA_RPC_FALLBACK_URLS]:
+        try:
+
+            response = session.post(rpc_url, data=body, headers=JSON_HEADERS, timeout=(3, 10))
+            if response.status_code == 200:
+                # jsonParsed transactions are large, decode them with orjson
+                result = orjson.loads(response.content).get("result")
+                if result:
+                    return (
+                        result["meta"]["postTokenBalances"],
+                        result["transaction"]["message"]["instructions"],
+                    )
+            else:
+                print(f"Attempt failed: {orjson.loads(response.content).get('error')}")
+        except SSLError as e:
+            print(f"SSL error occurred: {e}")
+        except requests.exceptions.RequestException as e:
+            print(f"An error occurred T: {e}")
+        except orjson.JSONDecodeError as e:
+            print(f"Invalid JSON in RPC response: {e}")
     return None  # type: ignore
 
 
@@ -155,9 +204,9 @@ def parse_new_pool(instruction_list: list[dict]) -> dict:  # type: ignore
     try:
         for instruction in instruction_list:
             program_id = instruction["programId"]
-            print(program_id, "\n")
             if program_id == TOKEN_PROGRAM_ID:
-                print("============NEW POOL DETECTED====================")
+                if DEBUG:
+                    print("============NEW POOL DETECTED====================")
 
                 return {
                     "Amm": instruction["accounts"][4],
@@ -2,11 +2,17 @@
 Token Quality Analyzer for finding high-potential gems
 Filters out scams, rug pulls, and low-quality tokens
 """
+import threading
+import time
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
 import requests
-from decimal import Decimal
-from typing import Optional, Dict, Any
+from bot.rpc import JSON_HEADERS, get_rpc_session
 from bot.config import (
     SOLANA_RPC_URL,
+    SOLANA_RPC_FALLBACK_URLS,
     MIN_LIQUIDITY_SOL,
     MAX_LIQUIDITY_SOL,
     OPTIMAL_LIQUIDITY_MIN,
@@ -19,7 +25,8 @@ from bot.config import (
     FILTER_PUMP_FUN_TOKENS,
     REQUIRE_MINT_REVOKED,
     REQUIRE_FREEZE_REVOKED,
-    MINIMUM_QUALITY_SCORE
+    MINIMUM_QUALITY_SCORE,
+    RPC_BATCH_REQUESTS
 )
 
 # Wrapped SOL address (used in most pairs)
@@ -28,33 +35,88 @@ WSOL_ADDRESS = "So11111111111111111111111111111111111111112"
 # Pump.fun program ID (filter these out - mostly scams)
 PUMP_FUN_PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
 
+# Runs the per-call requests side by side when RPC batching is turned off
+_RPC_CALL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rpc-call")
+
+# Liquidity scoring bands as (low SOL, high SOL, points, label), checked in
+# order so the optimal band wins on shared edges; anything else scores 10
+LIQUIDITY_BANDS = (
+    (OPTIMAL_LIQUIDITY_MIN, OPTIMAL_LIQUIDITY_MAX, 30, "Optimal"),
+    (MIN_LIQUIDITY_SOL, OPTIMAL_LIQUIDITY_MIN, 20, "Decent"),
+    (OPTIMAL_LIQUIDITY_MAX, OPTIMAL_LIQUIDITY_MAX * 2, 20, "Good"),
+)
+
+# Constant part of the getAccountInfo params, built once rather than per token
+JSON_PARSED_CONFIG = {"encoding": "jsonParsed"}
+
+# How long a token's on-chain lookups are reused before being fetched again
+ONCHAIN_CACHE_TTL = 300  # seconds
+
+# How long a token rejected on its own merits (pump.fun mint, authorities,
+# holder concentration) is rejected again without any RPC calls
+REJECTED_CACHE_TTL = 3600  # seconds
+
+# Tokens per batched request when prefetching for analyze_batch (3 calls each),
+# kept well under common provider batch size limits
+ONCHAIN_BATCH_TOKENS = 50
+
+# (connect, read) timeouts for analyzer RPC calls; a slow node gets one quick
+# retry (or the next backup URL) rather than stalling the analysis
+RPC_TIMEOUT = (1, 3)
+
+# After this many consecutive failed requests, skip the RPC for a cooldown
+RPC_BREAKER_THRESHOLD = 5
+RPC_BREAKER_COOLDOWN = 30  # seconds
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Outcome of analyze_token"""
+
+    quality_score: int = 0
+    should_alert: bool = False
+    token_address: str = ""
+    token_volume: float = 0
+    liquidity_sol: float = 0
+    market_cap: float = 0
+    holder_concentration: float = 0
+    security_checks: Dict[str, bool] = field(default_factory=dict)
+    reasons: List[str] = field(default_factory=list)
+
 
 class TokenQualityAnalyzer:
     """Analyzes token quality and calculates a quality score (0-100)"""
 
-    def __init__(self, rpc_url: str | None = SOLANA_RPC_URL):
+    def __init__(self, rpc_url: str | None = SOLANA_RPC_URL,
+                 fallback_urls: List[str] = SOLANA_RPC_FALLBACK_URLS):
         if not rpc_url:
             raise ValueError("SOLANA_RPC_URL must be set in environment variables")
         self.rpc_url = rpc_url
+        self.fallback_urls = fallback_urls
+        # Turned off for good if the RPC turns out to reject batches
+        self.batch_requests = RPC_BATCH_REQUESTS
+        # token address -> (expiry, future bundle); concurrent analyses of the
+        # same token wait on one in-flight fetch instead of each starting one
+        self._onchain_cache: Dict[str, Tuple[float, Future]] = {}
+        self._onchain_lock = threading.Lock()
+        # token address -> (expiry, reason) for rejections that don't depend on the pool
+        self._rejected_tokens: Dict[str, Tuple[float, str]] = {}
+        # Breaker state, touched by every analysis thread, so guarded by its own lock
+        self._rpc_lock = threading.Lock()
+        self._rpc_failures = 0
+        self._rpc_paused_until = 0.0
 
     def analyze_token(self, token_address: str, token0_volume: float, token1_volume: float,
-                     token0_address: str, token1_address: str) -> Dict[str, Any]:
+                     token0_address: str, token1_address: str) -> AnalysisResult:
         """
         Comprehensive token quality analysis
 
         Returns:
-            dict with keys: quality_score, should_alert, liquidity_sol, market_cap,
-                           holder_concentration, security_checks, reasons
+            AnalysisResult with quality_score, should_alert, token_address, token_volume,
+                           liquidity_sol, market_cap, holder_concentration,
+                           security_checks, reasons
         """
-        result = {
-            "quality_score": 0,
-            "should_alert": False,
-            "liquidity_sol": 0,
-            "market_cap": 0,
-            "holder_concentration": 0,
-            "security_checks": {},
-            "reasons": []
-        }
+        result = AnalysisResult()
 
         # Determine which token is SOL and which is the new token
         if token0_address == WSOL_ADDRESS:
@@ -67,125 +129,187 @@ class TokenQualityAnalyzer:
             new_token_address = token0_address
         else:
             # Neither token is SOL - skip these exotic pairs
-            result["reasons"].append("No SOL pair - exotic pair")
+            result.reasons.append("No SOL pair - exotic pair")
             return result
 
-        result["liquidity_sol"] = sol_volume
+        result.token_address = new_token_address
+        result.token_volume = token_volume
+        result.liquidity_sol = sol_volume
 
         # CRITICAL FILTER 1: Minimum Liquidity
         if sol_volume < MIN_LIQUIDITY_SOL:
-            result["reasons"].append(f"Insufficient liquidity: {sol_volume:.2f} SOL < {MIN_LIQUIDITY_SOL} SOL minimum")
+            result.reasons.append(f"Insufficient liquidity: {sol_volume:.2f} SOL < {MIN_LIQUIDITY_SOL} SOL minimum")
             return result
 
         # CRITICAL FILTER 2: Maximum Liquidity (too high = hard to pump)
         if sol_volume > MAX_LIQUIDITY_SOL:
-            result["reasons"].append(f"Liquidity too high for moonshot: {sol_volume:.2f} SOL > {MAX_LIQUIDITY_SOL} SOL")
+            result.reasons.append(f"Liquidity too high for moonshot: {sol_volume:.2f} SOL > {MAX_LIQUIDITY_SOL} SOL")
             return result
 
         # CRITICAL FILTER 3: Check if pump.fun token (filter by address pattern)
-        if FILTER_PUMP_FUN_TOKENS and self._is_pump_fun_token(new_token_address):
-            result["reasons"].append("Pump.fun token detected - high scam risk")
+        # The address test is free, so it runs before any RPC work
+        if FILTER_PUMP_FUN_TOKENS and self._is_pump_fun_token(new_token_address, None):
+            result.reasons.append("Pump.fun token detected - high scam risk")
+            return result
+
+        # Tokens rejected for something about the token itself stay rejected for a while
+        cached_rejection = self._cached_rejection(new_token_address)
+        if cached_rejection:
+            result.reasons.append(cached_rejection)
             return result
 
+        # Mint account, supply and largest holders come back in one batched round trip
+        onchain = self._fetch_onchain_bundle(new_token_address)
+        mint_account = onchain["mint_account"]
+
+        # Pump.fun tokens without the address suffix are caught by their mint owner
+        if FILTER_PUMP_FUN_TOKENS and self._is_pump_fun_token(new_token_address, mint_account):
+            result.reasons.append("Pump.fun token detected - high scam risk")
+            return self._remember_rejection(new_token_address, result)
+
         # Start calculating quality score
         score = 0
 
         # SCORE COMPONENT 1: Liquidity (0-30 points)
         # Sweet spot: configured optimal range
-        if OPTIMAL_LIQUIDITY_MIN <= sol_volume <= OPTIMAL_LIQUIDITY_MAX:
-            score += 30
-            result["reasons"].append(f"✓ Optimal liquidity: {sol_volume:.2f} SOL")
-        elif MIN_LIQUIDITY_SOL <= sol_volume < OPTIMAL_LIQUIDITY_MIN:
-            score += 20
-            result["reasons"].append(f"✓ Decent liquidity: {sol_volume:.2f} SOL")
-        elif OPTIMAL_LIQUIDITY_MAX < sol_volume <= (OPTIMAL_LIQUIDITY_MAX * 2):
-            score += 20
-            result["reasons"].append(f"✓ Good liquidity: {sol_volume:.2f} SOL")
-        else:
-            score += 10
-            result["reasons"].append(f"✓ Acceptable liquidity: {sol_volume:.2f} SOL")
+        points, label = 10, "Acceptable"
+        for low, high, band_points, band_label in LIQUIDITY_BANDS:
+            if low <= sol_volume <= high:
+                points, label = band_points, band_label
+                break
+        score += points
+        result.reasons.append(f"✓ {label} liquidity: {sol_volume:.2f} SOL")
+
+        # Total supply is needed for both market cap and holder share
+        total_supply = onchain["total_supply"]
 
         # SCORE COMPONENT 2: Market Cap (0-25 points)
         # Estimate market cap based on pool ratio
         try:
-            market_cap = self._estimate_market_cap(sol_volume, token_volume, new_token_address)
-            result["market_cap"] = market_cap
+            market_cap = self._estimate_market_cap(sol_volume, token_volume, total_supply)
+            result.market_cap = market_cap
 
             # Sweet spot: configured range for moonshot potential
             if MARKET_CAP_MIN <= market_cap <= MARKET_CAP_MAX:
                 score += 25
-                result["reasons"].append(f"✓ Moonshot market cap: ${market_cap:,.0f}")
+                result.reasons.append(f"✓ Moonshot market cap: ${market_cap:,.0f}")
             elif MARKET_CAP_MAX < market_cap <= MARKET_CAP_UPPER_LIMIT:
                 score += 15
-                result["reasons"].append(f"✓ Decent market cap: ${market_cap:,.0f}")
+                result.reasons.append(f"✓ Decent market cap: ${market_cap:,.0f}")
             elif market_cap < MARKET_CAP_MIN:
                 score += 5
-                result["reasons"].append(f"⚠ Very low market cap: ${market_cap:,.0f} (high risk)")
+                result.reasons.append(f"⚠ Very low market cap: ${market_cap:,.0f} (high risk)")
             else:
-                result["reasons"].append(f"⚠ High market cap: ${market_cap:,.0f} (limited upside)")
+                result.reasons.append(f"⚠ High market cap: ${market_cap:,.0f} (limited upside)")
         except Exception as e:
-            result["reasons"].append(f"⚠ Could not calculate market cap: {e}")
+            result.reasons.append(f"⚠ Could not calculate market cap: {e}")
 
         # SCORE COMPONENT 3: Token Security (0-30 points)
-        security = self._check_token_security(new_token_address)
-        result["security_checks"] = security
+        security = self._check_token_security(mint_account)
+        result.security_checks = security
 
         if security.get("mint_authority_revoked"):
             score += 15
-            result["reasons"].append("✓ Mint authority revoked (immutable supply)")
+            result.reasons.append("✓ Mint authority revoked (immutable supply)")
         else:
-            result["reasons"].append("⚠ Mint authority NOT revoked (can create infinite tokens)")
+            result.reasons.append("⚠ Mint authority NOT revoked (can create infinite tokens)")
             if REQUIRE_MINT_REVOKED:
-                result["reasons"].append("❌ REJECTED: Mint authority required to be revoked")
-                return result
+                result.reasons.append("❌ REJECTED: Mint authority required to be revoked")
+                if mint_account is None:
+                    return result  # Lookup failed, don't remember it as the token's fault
+                return self._remember_rejection(new_token_address, result)
 
         if security.get("freeze_authority_revoked"):
             score += 15
-            result["reasons"].append("✓ Freeze authority revoked (not a honeypot)")
+            result.reasons.append("✓ Freeze authority revoked (not a honeypot)")
         else:
-            result["reasons"].append("⚠ Freeze authority NOT revoked (potential honeypot)")
+            result.reasons.append("⚠ Freeze authority NOT revoked (potential honeypot)")
             if REQUIRE_FREEZE_REVOKED:
-                result["reasons"].append("❌ REJECTED: Freeze authority required to be revoked")
-                return result
+                result.reasons.append("❌ REJECTED: Freeze authority required to be revoked")
+                if mint_account is None:
+                    return result  # Lookup failed, don't remember it as the token's fault
+                return self._remember_rejection(new_token_address, result)
 
         # SCORE COMPONENT 4: Holder Distribution (0-15 points)
-        holder_data = self._check_holder_distribution(new_token_address)
+        holder_data = self._check_holder_distribution(onchain["largest_accounts"], total_supply)
         if holder_data:
             top_holder_pct = holder_data.get("top_holder_percentage", 100)
-            result["holder_concentration"] = top_holder_pct
+            result.holder_concentration = top_holder_pct
 
             # Check against configured maximum
             if top_holder_pct > MAX_TOP_HOLDER_PERCENTAGE:
-                result["reasons"].append(f"❌ High concentration: Top holder {top_holder_pct:.1f}% > {MAX_TOP_HOLDER_PERCENTAGE}% (rug risk)")
-                return result
+                result.reasons.append(f"❌ High concentration: Top holder {top_holder_pct:.1f}% > {MAX_TOP_HOLDER_PERCENTAGE}% (rug risk)")
+                return self._remember_rejection(new_token_address, result)
 
             if top_holder_pct < 30:
                 score += 15
-                result["reasons"].append(f"✓ Great distribution: Top holder {top_holder_pct:.1f}%")
+                result.reasons.append(f"✓ Great distribution: Top holder {top_holder_pct:.1f}%")
             elif top_holder_pct < 50:
                 score += 10
-                result["reasons"].append(f"✓ Good distribution: Top holder {top_holder_pct:.1f}%")
+                result.reasons.append(f"✓ Good distribution: Top holder {top_holder_pct:.1f}%")
             elif top_holder_pct <= MAX_TOP_HOLDER_PERCENTAGE:
                 score += 5
-                result["reasons"].append(f"⚠ Moderate concentration: Top holder {top_holder_pct:.1f}%")
+                result.reasons.append(f"⚠ Moderate concentration: Top holder {top_holder_pct:.1f}%")
         else:
             score += 5  # Give benefit of doubt if we can't check
-            result["reasons"].append("⚠ Could not verify holder distribution")
+            result.reasons.append("⚠ Could not verify holder distribution")
 
-        result["quality_score"] = score
+        result.quality_score = score
 
         # Use configured minimum quality score
         if score >= MINIMUM_QUALITY_SCORE:
-            result["should_alert"] = True
-            result["reasons"].append(f"🚀 HIGH QUALITY GEM: Score {score}/100")
+            result.should_alert = True
+            result.reasons.append(f"🚀 HIGH QUALITY GEM: Score {score}/100")
         elif score >= 50:
-            result["reasons"].append(f"⚠ MODERATE QUALITY: Score {score}/100 (below threshold of {MINIMUM_QUALITY_SCORE})")
+            result.reasons.append(f"⚠ MODERATE QUALITY: Score {score}/100 (below threshold of {MINIMUM_QUALITY_SCORE})")
         else:
-            result["reasons"].append(f"❌ LOW QUALITY: Score {score}/100 (rejected)")
+            result.reasons.append(f"❌ LOW QUALITY: Score {score}/100 (rejected)")
 
         return result
 
-    def _is_pump_fun_token(self, token_address: str) -> bool:
+    def analyze_batch(self, pairs: List[Dict[str, Any]]) -> List[AnalysisResult]:
+        """
+        Analyze several pools at once
+
+        Each pair holds the analyze_token keyword arguments. The on-chain
+        lookups for every pair that passes quick_filter go out in batched
+        requests up front, so the per-pair analyses are served from cache.
+
+        Returns:
+            analyze_token results in input order
+        """
+        token_addresses = [
+            pair["token1_address"] if pair["token0_address"] == WSOL_ADDRESS else pair["token0_address"]
+            for pair in pairs
+            if quick_filter(pair["token0_volume"], pair["token1_volume"],
+                            pair["token0_address"], pair["token1_address"])
+        ]
+        self._prefetch_onchain_bundles(token_addresses)
+
+        return [self.analyze_token(**pair) for pair in pairs]
+
+    def _cached_rejection(self, token_address: str) -> Optional[str]:
+        """Return the reason a token was recently rejected, if it was"""
+        with self._onchain_lock:
+            entry = self._rejected_tokens.get(token_address)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _remember_rejection(self, token_address: str, result: AnalysisResult) -> AnalysisResult:
+        """Record a token-level rejection (its last reason) and pass the result through"""
+        now = time.monotonic()
+        with self._onchain_lock:
+            if len(self._rejected_tokens) > 10_000:
+                self._rejected_tokens = {
+                    address: entry for address, entry in self._rejected_tokens.items()
+                    if entry[0] > now
+                }
+            self._rejected_tokens[token_address] = (now + REJECTED_CACHE_TTL, result.reasons[-1])
+        return result
+
+    def _is_pump_fun_token(self, token_address: str,
+                           mint_account: Optional[Dict[str, Any]]) -> bool:
         """
         Check if token is from pump.fun (usually ends with 'pump')
         These are typically low-quality meme coins
@@ -194,31 +318,195 @@ class TokenQualityAnalyzer:
         if token_address.endswith("pump"):
             return True
 
-        # Additional check: Query token metadata to see if it's a pump.fun token
+        # Additional check: see if the account's program owner is pump.fun
+        return mint_account is not None and mint_account.get("owner") == PUMP_FUN_PROGRAM
+
+    def _fetch_onchain_bundle(self, token_address: str) -> Dict[str, Any]:
+        """
+        Get the on-chain bundle for a token, reusing a recent or in-flight
+        fetch for the same address
+        """
+        now = time.monotonic()
+        with self._onchain_lock:
+            entry = self._onchain_cache.get(token_address)
+            if entry and entry[0] > now:
+                future, owner = entry[1], False
+            else:
+                if len(self._onchain_cache) > 1024:
+                    self._onchain_cache = {
+                        address: cached for address, cached in self._onchain_cache.items()
+                        if cached[0] > now
+                    }
+                future, owner = Future(), True
+                self._onchain_cache[token_address] = (now + ONCHAIN_CACHE_TTL, future)
+
+        if owner:
+            try:
+                bundle = self._load_onchain_bundle(token_address)
+            except Exception as e:
+                with self._onchain_lock:
+                    self._onchain_cache.pop(token_address, None)
+                future.set_exception(e)
+                raise
+
+            # Don't hold on to a failed or partial lookup for the whole TTL
+            if not bundle["complete"]:
+                with self._onchain_lock:
+                    self._onchain_cache.pop(token_address, None)
+            future.set_result(bundle)
+
+        return future.result()
+
+    def _load_onchain_bundle(self, token_address: str) -> Dict[str, Any]:
+        """
+        Fetch the mint account, total supply and largest holders for a token
+        in a single JSON-RPC batch request
+        """
+        return self._bundle_from_results(*self._rpc_batch(self._onchain_calls(token_address)))
+
+    def _prefetch_onchain_bundles(self, token_addresses: List[str]) -> None:
+        """
+        Fetch the on-chain bundles for several tokens in batched requests and
+        cache them, skipping tokens that are already cached or recently rejected
+        """
+        now = time.monotonic()
+        with self._onchain_lock:
+            missing = [
+                address for address in dict.fromkeys(token_addresses)
+                if not (address in self._onchain_cache and self._onchain_cache[address][0] > now)
+            ]
+        # analyze_token turns these away before any RPC work, don't fetch them either
+        missing = [address for address in missing if not self._cached_rejection(address)]
+
+        calls_per_token = len(self._onchain_calls(""))
+        for start in range(0, len(missing), ONCHAIN_BATCH_TOKENS):
+            chunk = missing[start:start + ONCHAIN_BATCH_TOKENS]
+            results = self._rpc_batch([call for address in chunk for call in self._onchain_calls(address)])
+
+            for i, address in enumerate(chunk):
+                bundle = self._bundle_from_results(*results[i * calls_per_token:(i + 1) * calls_per_token])
+                if not bundle["complete"]:
+                    continue
+
+                future: Future = Future()
+                future.set_result(bundle)
+                with self._onchain_lock:
+                    self._onchain_cache[address] = (time.monotonic() + ONCHAIN_CACHE_TTL, future)
+
+    @staticmethod
+    def _onchain_calls(token_address: str) -> List[Tuple[str, List[Any]]]:
+        """The JSON-RPC calls that make up a token's on-chain bundle"""
+        return [
+            ("getAccountInfo", [token_address, JSON_PARSED_CONFIG]),
+            ("getTokenSupply", [token_address]),
+            ("getTokenLargestAccounts", [token_address]),
+        ]
+
+    @staticmethod
+    def _bundle_from_results(mint_info: Any, supply_info: Any, largest_info: Any) -> Dict[str, Any]:
+        """
+        Build the on-chain bundle from the results of _onchain_calls
+        "complete" is False when any call failed, so the bundle isn't cached
+        """
+        return {
+            "mint_account": mint_info["value"] if mint_info else None,
+            "total_supply": (supply_info["value"]["uiAmount"] or 0) if supply_info else 0,
+            "largest_accounts": largest_info["value"] if largest_info else [],
+            "complete": bool(mint_info and mint_info["value"] and supply_info and largest_info),
+        }
+
+    def _rpc_batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Send several JSON-RPC calls in one HTTP request, or one request per
+        call when RPC_BATCH_REQUESTS is off or the RPC rejects batches
+        Returns each call's result in order (None where a call failed)
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        if not self.batch_requests:
+            # None of the calls depend on each other, so don't pay for them serially
+            return list(_RPC_CALL_POOL.map(self._rpc_call, payload))
+
+        results: List[Any] = [None] * len(calls)
+
         try:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getAccountInfo",
-                "params": [
-                    token_address,
-                    {"encoding": "jsonParsed"}
-                ]
-            }
-            response = requests.post(self.rpc_url, json=payload, timeout=5)
-            data = response.json()
-
-            # Check if the program owner is pump.fun
-            if data.get("result", {}).get("value", {}).get("owner") == PUMP_FUN_PROGRAM:
-                return True
-
-        except Exception:
-            pass
+            response = self._post(payload)
 
-        return False
+            # A provider that doesn't take batches answers with a single error object
+            if not isinstance(response, list):
+                error = response.get("error") if isinstance(response, dict) else response
+                print(f"RPC rejected a batched request ({error}), sending calls one by one from now on "
+                      "- set RPC_BATCH_REQUESTS=false to skip this")
+                self.batch_requests = False
+                return list(_RPC_CALL_POOL.map(self._rpc_call, payload))
+
+            # Batch responses can come back in any order, route them by id
+            for item in response:
+                results[item["id"]] = item.get("result")
+
+        except Exception as e:
+            print(f"Error in batched RPC request: {e}")
+
+        return results
+
+    def _rpc_call(self, call: Dict[str, Any]) -> Any:
+        """Send a single JSON-RPC call, returns its result or None"""
+        try:
+            return self._post(call).get("result")
+
+        except Exception as e:
+            print(f"Error in {call['method']} RPC request: {e}")
+
+        return None
+
+    def _post(self, payload: Any) -> Any:
+        """
+        POST a JSON-RPC payload and return the decoded body, failing over to
+        the backup URLs (or retrying once without any) when the RPC times out,
+        is unreachable or answers non-2xx, and skipping the request while the
+        RPC is paused
+        """
+        with self._rpc_lock:
+            paused = time.monotonic() < self._rpc_paused_until
+        if paused:
+            raise RuntimeError("RPC paused after repeated failures")
+
+        body = orjson.dumps(payload)
+        urls = [self.rpc_url, *self.fallback_urls] if self.fallback_urls else [self.rpc_url] * 2
+        for attempt, url in enumerate(urls, start=1):
+            try:
+                response = get_rpc_session().post(
+                    url, data=body, headers=JSON_HEADERS, timeout=RPC_TIMEOUT
+                )
+                # An overloaded node usually answers fast with 429/503, so any
+                # non-2xx fails over like a timeout and only a 2xx counts as success
+                response.raise_for_status()
+                break
+            except (requests.Timeout, requests.ConnectionError, requests.HTTPError):
+                if attempt == len(urls):
+                    self._record_rpc_failure()
+                    raise
+
+        with self._rpc_lock:
+            self._rpc_failures = 0
+        return orjson.loads(response.content)
+
+    def _record_rpc_failure(self) -> None:
+        """Count a failed RPC request and pause the RPC after too many in a row"""
+        with self._rpc_lock:
+            self._rpc_failures += 1
+            failures = self._rpc_failures
+            tripped = failures >= RPC_BREAKER_THRESHOLD
+            if tripped:
+                self._rpc_paused_until = time.monotonic() + RPC_BREAKER_COOLDOWN
+                self._rpc_failures = 0
+        if tripped:
+            print(f"RPC failed {failures} times in a row, pausing for {RPC_BREAKER_COOLDOWN}s")
 
     def _estimate_market_cap(self, sol_amount: float, token_amount: float,
-                            token_address: str) -> float:
+                            total_supply: float) -> float:
         """
         Estimate market cap based on initial liquidity pool ratio
         Uses SOL_PRICE_USD from config
@@ -226,11 +514,7 @@ class TokenQualityAnalyzer:
         if token_amount == 0:
             return 0
 
-        # Get token total supply
         try:
-            supply_info = self._get_token_supply(token_address)
-            total_supply = supply_info.get("total_supply", 0)
-
             if total_supply == 0:
                 return 0
 
@@ -251,28 +535,7 @@ class TokenQualityAnalyzer:
             market_cap_sol = token_price_in_sol * estimated_supply
             return market_cap_sol * SOL_PRICE_USD
 
-    def _get_token_supply(self, token_address: str) -> Dict[str, float]:
-        """Get token total supply from blockchain"""
-        try:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTokenSupply",
-                "params": [token_address]
-            }
-            response = requests.post(self.rpc_url, json=payload, timeout=5)
-            data = response.json()
-
-            if "result" in data:
-                ui_amount = data["result"]["value"]["uiAmount"]
-                return {"total_supply": ui_amount}
-
-        except Exception as e:
-            print(f"Error fetching token supply: {e}")
-
-        return {"total_supply": 0}
-
-    def _check_token_security(self, token_address: str) -> Dict[str, bool]:
+    def _check_token_security(self, mint_account: Optional[Dict[str, Any]]) -> Dict[str, bool]:
         """
         Check critical security parameters:
         - Mint authority (should be revoked/null)
@@ -284,20 +547,8 @@ class TokenQualityAnalyzer:
         }
 
         try:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getAccountInfo",
-                "params": [
-                    token_address,
-                    {"encoding": "jsonParsed"}
-                ]
-            }
-            response = requests.post(self.rpc_url, json=payload, timeout=5)
-            data = response.json()
-
-            if "result" in data and data["result"]:
-                parsed_data = data["result"]["value"]["data"]["parsed"]["info"]
+            if mint_account:
+                parsed_data = mint_account["data"]["parsed"]["info"]
 
                 # Check mint authority
                 mint_authority = parsed_data.get("mintAuthority")
@@ -314,38 +565,22 @@ class TokenQualityAnalyzer:
 
         return result
 
-    def _check_holder_distribution(self, token_address: str) -> Optional[Dict[str, float]]:
+    def _check_holder_distribution(self, accounts: List[Dict[str, Any]],
+                                   total_supply: float) -> Optional[Dict[str, float]]:
         """
         Check holder distribution to detect potential rug pulls
         Returns top holder percentage
         """
         try:
-            # Get largest token holders
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTokenLargestAccounts",
-                "params": [token_address]
-            }
-            response = requests.post(self.rpc_url, json=payload, timeout=5)
-            data = response.json()
-
-            if "result" in data and data["result"]["value"]:
-                accounts = data["result"]["value"]
-
-                # Get total supply
-                supply_info = self._get_token_supply(token_address)
-                total_supply = supply_info.get("total_supply", 0)
-
-                if total_supply > 0 and len(accounts) > 0:
-                    # Calculate top holder percentage
-                    top_holder_amount = accounts[0]["uiAmount"]
-                    top_holder_pct = (top_holder_amount / total_supply) * 100
-
-                    return {
-                        "top_holder_percentage": top_holder_pct,
-                        "total_holders": len(accounts)
-                    }
+            if total_supply > 0 and len(accounts) > 0:
+                # Calculate top holder percentage
+                top_holder_amount = accounts[0]["uiAmount"]
+                top_holder_pct = (top_holder_amount / total_supply) * 100
+
+                return {
+                    "top_holder_percentage": top_holder_pct,
+                    "total_holders": len(accounts)
+                }
 
         except Exception as e:
             print(f"Error checking holder distribution: {e}")